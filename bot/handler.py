@@ -18,6 +18,14 @@ from bot.platforms import ALL_PLATFORMS
 if TYPE_CHECKING:
     from bot.platforms.base import BotPlatform
 
+# orjson 可选：解析更快且可直接接受 bytes，未安装时回退到标准库
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_loads(body: bytes) -> Any:
+        return json.loads(body.decode('utf-8'))
+
 logger = logging.getLogger(__name__)
 
 # 平台实例缓存
@@ -91,8 +99,8 @@ def handle_webhook(
     
     # 解析 JSON 数据
     try:
-        data = json.loads(body.decode('utf-8')) if body else {}
-    except json.JSONDecodeError as e:
+        data = _json_loads(body) if body else {}
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         logger.error(f"[BotHandler] JSON 解析失败: {e}")
         return WebhookResponse.error("Invalid JSON", 400)
     
@@ -7,11 +7,19 @@
 定义统一的消息和响应模型，屏蔽各平台差异。
 """
 
+import json
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Dict, Any, Optional, List
 
+# orjson 可选：序列化更快，未安装时回退到标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class ChatType(str, Enum):
     """会话类型"""
@@ -49,6 +57,7 @@ class BotMessage:
         mentions: @的用户列表
         timestamp: 消息时间戳
         raw_data: 原始请求数据（平台特定，用于调试）
+        raw_bytes: raw_data 的 JSON 字节（首次访问时序列化并缓存，用于日志/审计落盘）
     """
     platform: str
     message_id: str
@@ -63,6 +72,13 @@ class BotMessage:
     timestamp: datetime = field(default_factory=datetime.now)
     raw_data: Dict[str, Any] = field(default_factory=dict)
     
+    @cached_property
+    def raw_bytes(self) -> bytes:
+        """原始请求数据的 JSON 序列化结果，只序列化一次"""
+        if orjson is not None:
+            return orjson.dumps(self.raw_data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(self.raw_data, ensure_ascii=False, default=str).encode('utf-8')
+    
     def get_command_and_args(self, prefix: str = "/") -> tuple:
         """
         解析命令和参数
@@ -10,18 +10,47 @@ Discord 平台适配器
 3. 将响应转换为 Discord 格式
 """
 
+import binascii
 import logging
 import json
-from typing import Dict, Any, Optional
-from nacl.signing import VerifyKey
-from nacl.exceptions import BadSignatureError
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
 from bot.platforms.base import BotPlatform
-from bot.models import BotMessage, WebhookResponse
+from bot.models import BotMessage, WebhookResponse, ChatType
+
+# Ed25519 验签：优先使用 cryptography（OpenSSL 优化实现），未安装时回退到 PyNaCl
+# 公钥对象按 Public Key 缓存，重复创建适配器时无需再次解析
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+    @lru_cache(maxsize=4)
+    def _load_verify_key(public_key: str) -> Any:
+        return Ed25519PublicKey.from_public_bytes(bytes.fromhex(public_key))
+
+    def _verify_signature(verify_key: Any, message: bytes, signature: bytes) -> None:
+        verify_key.verify(signature, message)
+except ImportError:
+    from nacl.signing import VerifyKey
+    from nacl.exceptions import BadSignatureError as InvalidSignature
+
+    @lru_cache(maxsize=4)
+    def _load_verify_key(public_key: str) -> Any:
+        return VerifyKey(bytes.fromhex(public_key))
+
+    def _verify_signature(verify_key: Any, message: bytes, signature: bytes) -> None:
+        verify_key.verify(message, signature)
 
 
 logger = logging.getLogger(__name__)
 
+# 请求合法性上限：在执行 Ed25519 验签前用廉价的长度比较拒绝明显异常的请求
+_MAX_BODY_SIZE = 256 * 1024      # Discord Interaction 请求体上限（字节）
+_SIGNATURE_HEX_LENGTH = 128      # Ed25519 签名为 64 字节，十六进制 128 字符
+_MAX_TIMESTAMP_LENGTH = 20       # Unix 时间戳字符串长度上限
+
 
 class DiscordPlatform(BotPlatform):
     """Discord 平台适配器（支持Slash Commands）"""
@@ -38,7 +67,7 @@ class DiscordPlatform(BotPlatform):
         
         if public_key:
             try:
-                self._verify_key = VerifyKey(bytes.fromhex(public_key))
+                self._verify_key = _load_verify_key(public_key)
             except Exception as e:
                 logger.warning(f"[Discord] 无法初始化验证密钥: {e}")
     
@@ -61,34 +90,72 @@ class DiscordPlatform(BotPlatform):
         Returns:
             签名是否有效
         """
-        logger.info("[Discord] 开始验证请求签名")
+        logger.debug("[Discord] 开始验证请求签名")
         
         if not self._verify_key:
             logger.warning("[Discord] 未配置Public Key，跳过签名验证")
             return True
         
-        signature = headers.get("x-signature-ed25519") or headers.get("X-Signature-Ed25519")
-        timestamp = headers.get("x-signature-timestamp") or headers.get("X-Signature-Timestamp")
+        # 统一转为小写后查找，兼容不同代理/框架的请求头大小写
+        lowered = {key.lower(): value for key, value in headers.items()}
+        signature = lowered.get("x-signature-ed25519")
+        timestamp = lowered.get("x-signature-timestamp")
         
-        logger.info(f"[Discord] 签名头: {signature[:20] if signature else 'None'}...")
-        logger.info(f"[Discord] 时间戳头: {timestamp}")
+        # 热路径日志使用 %-style 延迟格式化，日志级别未启用时不产生字符串开销
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[Discord] 签名头: %s...", signature[:20] if signature else None)
+            logger.debug("[Discord] 时间戳头: %s", timestamp)
         
         if not signature or not timestamp:
             logger.warning("[Discord] 缺少签名或时间戳")
             return False
         
+        if (len(body) > _MAX_BODY_SIZE
+                or len(signature) != _SIGNATURE_HEX_LENGTH
+                or len(timestamp) >= _MAX_TIMESTAMP_LENGTH):
+            logger.warning("[Discord] 请求体、签名或时间戳长度异常，拒绝请求")
+            return False
+        
         try:
-            message = timestamp.encode() + body
-            self._verify_key.verify(message, bytes.fromhex(signature))
+            message = timestamp.encode("ascii") + body
+            _verify_signature(self._verify_key, message, binascii.unhexlify(signature))
             logger.info("[Discord] Ed25519 签名验证成功 ✓")
             return True
-        except BadSignatureError:
+        except InvalidSignature:
             logger.error("[Discord] 签名验证失败：Bad Signature")
             return False
         except Exception as e:
-            logger.error(f"[Discord] 签名验证异常: {e}")
+            logger.error("[Discord] 签名验证异常: %s", e)
             return False
     
+    def verify_batch(
+        self,
+        items: List[Tuple[Dict[str, str], bytes]],
+        max_workers: int = 4
+    ) -> List[bool]:
+        """批量验证多个 Discord Interactions 请求签名
+        
+        适用于先入队、再集中处理的场景：使用线程池并发验签，
+        结果顺序与输入一致。Webhook 服务本身已按请求分线程处理，
+        单个请求仍直接调用 verify_request 即可。
+        
+        Args:
+            items: (headers, body) 元组列表
+            max_workers: 最大并发线程数
+        
+        Returns:
+            与 items 一一对应的验证结果列表
+        """
+        if len(items) <= 1 or not self._verify_key:
+            return [self.verify_request(headers, body) for headers, body in items]
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+                return list(executor.map(lambda item: self.verify_request(*item), items))
+        except Exception as e:
+            logger.warning(f"[Discord] 批量验签失败，回退为逐个验证: {e}")
+            return [self.verify_request(headers, body) for headers, body in items]
+    
     def parse_message(self, data: Dict[str, Any]) -> Optional[BotMessage]:
         """解析 Discord Slash Command 为统一格式
         
@@ -99,45 +166,38 @@ class DiscordPlatform(BotPlatform):
             BotMessage 对象，或 None（不需要处理）
         """
         # Interaction类型：1=Ping, 2=ApplicationCommand, 3=MessageComponent
-        interaction_type = data.get("type")
-        
-        # Ping请求（验证）直接返回None，在handle_challenge中处理
-        if interaction_type == 1:
+        # 只处理Application Command (Slash Command)；Ping 在 handle_challenge 中处理
+        if data.get("type") != 2:
             return None
         
-        # 只处理Application Command (Slash Command)
-        if interaction_type != 2:
-            return None
+        get = data.get
         
         # 提取命令信息
-        command_data = data.get("data", {})
+        command_data = get("data") or {}
         command_name = command_data.get("name", "")
-        options = command_data.get("options", [])
+        options = command_data.get("options")
         
-        # 构建命令内容
-        content = f"/{command_name}"
+        # 构建命令内容（参数值按顺序以空格拼接）
         if options:
-            # 提取参数值
-            args = []
-            for option in options:
-                args.append(str(option.get("value", "")))
-            if args:
-                content = f"/{command_name} {' '.join(args)}"
-        
-        # 提取用户信息
-        user = data.get("member", {}).get("user", data.get("user", {}))
+            joined = " ".join(str(option.get("value", "")) for option in options)
+            content = f"/{command_name} {joined}"
+        else:
+            content = f"/{command_name}"
+        
+        # 提取用户信息（服务器内为 member.user，私聊为 user）
+        member = get("member")
+        user = (member.get("user") if member else None) or get("user") or {}
         user_id = user.get("id", "")
         user_name = user.get("username", "unknown")
         
         # 提取频道和服务器信息
-        channel_id = data.get("channel_id", "")
-        guild_id = data.get("guild_id", "")
+        channel_id = get("channel_id", "")
+        guild_id = get("guild_id", "")
         
         # 构建 BotMessage 对象
-        from bot.models import ChatType
         message = BotMessage(
             platform="discord",
-            message_id=data.get("id", ""),
+            message_id=get("id", ""),
             user_id=user_id,
             user_name=user_name,
             chat_id=channel_id or guild_id,
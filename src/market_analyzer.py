@@ -12,9 +12,10 @@
 
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 import pandas as pd
 
@@ -25,9 +26,85 @@ from data_provider.base import DataFetcherManager
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# 复盘报告 Prompt 模板（模块级常量，避免每次调用重复构建）
+_REVIEW_PROMPT_TMPL = """你是一位专业的美股/港股市场分析师，请根据以下数据生成一份简洁的大盘复盘报告。
+
+【重要】输出要求：
+- 必须输出纯 Markdown 文本格式
+- 禁止输出 JSON 格式
+- 禁止输出代码块
+- emoji 仅在标题处少量使用（每个标题最多1个）
+
+---
+
+# 今日市场数据
+
+## 日期
+{date}
+
+## 主要指数
+{indices}
+
+## 市场新闻
+{news}
+
+{news_warning}
+
+---
+
+# 输出格式模板（请严格按此格式输出）
+
+## 📊 {date} 全球市场复盘
+
+### 一、市场总结
+（2-3句话概括今日纳斯达克和恒生指数的整体表现）
+
+### 二、指数点评
+（分析纳斯达克综合指数和恒生指数的走势特点、技术形态）
+
+### 三、市场热点
+（解读当前美股和港股市场的热点板块、主题投资机会）
+
+### 四、影响因素
+（分析影响市场走势的关键因素：美联储政策、经济数据、地缘政治等）
+
+### 五、后市展望
+（结合当前走势和新闻，给出未来市场预判）
+
+### 六、风险提示
+（需要关注的风险点）
+
+---
+
+请直接输出复盘报告内容，不要输出其他说明文字。
+"""
+
+# 指数行情缺失时追加的提示
+_NEWS_ONLY_WARNING = "注意：由于行情数据获取失败，请主要根据【市场新闻】进行定性分析和总结，不要编造具体的指数点位。"
+
+# 按是否有指数行情预先特化的两个模板，调用时只需填充日期、指数和新闻
+_TMPL_WITH_INDICES = _REVIEW_PROMPT_TMPL.replace("{news_warning}", "")
+_TMPL_NEWS_ONLY = (
+    _REVIEW_PROMPT_TMPL
+    .replace("{indices}", "暂无指数数据（接口异常）")
+    .replace("{news_warning}", _NEWS_ONLY_WARNING)
+)
+
+# 涨跌方向箭头，按 sign(change_pct) + 1 索引：下跌 / 平盘 / 上涨
+_DIRECTION_ARROWS = ("↓", "-", "↑")
+
+# 缓存主要指数行情（避免重试/多次复盘时重复请求）
+# TTL 设为 1 分钟 (60秒)：行情最多每分钟变化一次
+_indices_cache: Dict[str, Any] = {
+    'data': None,
+    'timestamp': 0,
+    'ttl': 60  # 1分钟缓存有效期
+}
+
+
+@dataclass(slots=True)
 class MarketIndex:
-    """大盘指数数据"""
+    """大盘指数数据（使用 __slots__，减少内存占用并加快属性访问）"""
     code: str                    # 指数代码
     name: str                    # 指数名称
     current: float = 0.0         # 当前点位
@@ -57,7 +134,7 @@ class MarketIndex:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketOverview:
     """市场概览数据"""
     date: str                           # 日期
@@ -106,8 +183,14 @@ class MarketAnalyzer:
     
     def _get_main_indices(self) -> List[MarketIndex]:
         """获取主要指数实时行情（纳斯达克和恒生指数）"""
-        import yfinance as yf
-        
+        # 检查缓存
+        current_time = time.monotonic()
+        if (_indices_cache['data'] is not None and
+                current_time - _indices_cache['timestamp'] < _indices_cache['ttl']):
+            cache_age = int(current_time - _indices_cache['timestamp'])
+            logger.debug(f"[缓存命中] 主要指数行情 - 缓存年龄 {cache_age}s/{_indices_cache['ttl']}s")
+            return list(_indices_cache['data'])
+
         indices = []
 
         # 定义要获取的指数：纳斯达克综合指数和恒生指数
@@ -119,67 +202,76 @@ class MarketAnalyzer:
         try:
             logger.info("[大盘] 获取主要指数实时行情（纳斯达克、恒生指数）...")
 
-            for code, name in index_mapping.items():
-                try:
-                    ticker = yf.Ticker(code)
-                    # 获取最近2天数据以计算涨跌
-                    hist = ticker.history(period='2d')
-                    
-                    if hist.empty:
-                        logger.warning(f"[大盘] {name} 数据为空")
-                        continue
-
-                    today = hist.iloc[-1]
-                    prev = hist.iloc[-2] if len(hist) > 1 else today
-
-                    price = float(today['Close'])
-                    prev_close = float(prev['Close'])
-                    change = price - prev_close
-                    change_pct = (change / prev_close) * 100 if prev_close else 0
-
-                    # 振幅
-                    high = float(today['High'])
-                    low = float(today['Low'])
-                    amplitude = ((high - low) / prev_close * 100) if prev_close else 0
-
-                    index = MarketIndex(
-                        code=code,
-                        name=name,
-                        current=price,
-                        change=change,
-                        change_pct=change_pct,
-                        open=float(today['Open']),
-                        high=high,
-                        low=low,
-                        prev_close=prev_close,
-                        volume=float(today['Volume']),
-                        amount=0.0,  # Yahoo Finance 不直接提供成交额
-                        amplitude=amplitude
-                    )
-                    indices.append(index)
-                    logger.info(f"[大盘] 获取 {name} 成功: {price:.2f} ({change_pct:+.2f}%)")
-
-                except Exception as e:
-                    logger.error(f"[大盘] 获取 {name} 失败: {e}")
-                    continue
+            # 各指数请求相互独立，并发获取以缩短网络等待时间（结果保持原顺序）
+            with ThreadPoolExecutor(max_workers=len(index_mapping)) as executor:
+                results = executor.map(self._fetch_index, index_mapping.keys(), index_mapping.values())
+                indices = [index for index in results if index is not None]
 
             if not indices:
                 logger.warning("[大盘] 所有指数数据获取失败，将依赖新闻搜索进行分析")
             else:
                 logger.info(f"[大盘] 获取到 {len(indices)} 个指数行情")
+                # 更新缓存（获取失败时不缓存，下次调用重新请求）
+                _indices_cache['data'] = list(indices)
+                _indices_cache['timestamp'] = current_time
 
         except Exception as e:
             logger.error(f"[大盘] 获取指数行情失败: {e}")
 
         return indices
 
+    def _fetch_index(self, code: str, name: str) -> Optional[MarketIndex]:
+        """获取单个指数行情，失败时返回 None"""
+        import yfinance as yf
+
+        try:
+            ticker = yf.Ticker(code)
+            # 获取最近2天数据以计算涨跌
+            hist = ticker.history(period='2d')
+            
+            if hist.empty:
+                logger.warning(f"[大盘] {name} 数据为空")
+                return None
+
+            # 一次性转为 numpy 数组按位置取值，避免逐行逐列构造 Series
+            rows = hist[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(dtype=float)
+            open_price, high, low, price, volume = rows[-1].tolist()
+            prev_close = rows[-2, 3].item() if len(rows) > 1 else price
+
+            change = price - prev_close
+            change_pct = (change / prev_close) * 100 if prev_close else 0
+
+            # 振幅
+            amplitude = ((high - low) / prev_close * 100) if prev_close else 0
+
+            index = MarketIndex(
+                code=code,
+                name=name,
+                current=price,
+                change=change,
+                change_pct=change_pct,
+                open=open_price,
+                high=high,
+                low=low,
+                prev_close=prev_close,
+                volume=volume,
+                amount=0.0,  # Yahoo Finance 不直接提供成交额
+                amplitude=amplitude
+            )
+            logger.info(f"[大盘] 获取 {name} 成功: {price:.2f} ({change_pct:+.2f}%)")
+            return index
+
+        except Exception as e:
+            logger.error(f"[大盘] 获取 {name} 失败: {e}")
+            return None
 
-    def search_market_news(self) -> List[Dict]:
+
+    def search_market_news(self) -> List[Tuple[str, str]]:
         """
         搜索市场新闻
         
         Returns:
-            新闻列表
+            新闻列表，每条为 (标题, 摘要) 元组
         """
         if not self.search_service:
             logger.warning("[大盘] 搜索服务未配置，跳过新闻搜索")
@@ -196,19 +288,26 @@ class MarketAnalyzer:
             "美股 港股 市场 热点",
         ]
         
+        def search_one(query: str):
+            # 使用 search_stock_news 方法，传入"大盘"作为股票名
+            return self.search_service.search_stock_news(
+                stock_code="market",
+                stock_name="大盘",
+                max_results=3,
+                focus_keywords=query.split()
+            )
+        
         try:
             logger.info("[大盘] 开始搜索市场新闻...")
             
-            for query in search_queries:
-                # 使用 search_stock_news 方法，传入"大盘"作为股票名
-                response = self.search_service.search_stock_news(
-                    stock_code="market",
-                    stock_name="大盘",
-                    max_results=3,
-                    focus_keywords=query.split()
-                )
+            # 各查询互不依赖，并发执行以缩短等待时间（结果保持查询顺序）
+            with ThreadPoolExecutor(max_workers=len(search_queries)) as executor:
+                responses = list(executor.map(search_one, search_queries))
+            
+            for query, response in zip(search_queries, responses):
                 if response and response.results:
-                    all_news.extend(response.results)
+                    # 入库时统一为 (title, snippet)，下游无需再区分对象/字典
+                    all_news.extend((r.title or "", r.snippet or "") for r in response.results)
                     logger.info(f"[大盘] 搜索 '{query}' 获取 {len(response.results)} 条结果")
             
             logger.info(f"[大盘] 共获取 {len(all_news)} 条市场新闻")
@@ -224,7 +323,7 @@ class MarketAnalyzer:
         
         Args:
             overview: 市场概览数据
-            news: 市场新闻列表 (SearchResult 对象列表)
+            news: 市场新闻列表 ((标题, 摘要) 元组列表)
             
         Returns:
             大盘复盘报告文本
@@ -270,75 +369,24 @@ class MarketAnalyzer:
     def _build_review_prompt(self, overview: MarketOverview, news: List) -> str:
         """构建复盘报告 Prompt"""
         # 指数行情信息（简洁格式，不用emoji）
-        indices_text = ""
-        for idx in overview.indices:
-            direction = "↑" if idx.change_pct > 0 else "↓" if idx.change_pct < 0 else "-"
-            indices_text += f"- {idx.name}: {idx.current:.2f} ({direction}{abs(idx.change_pct):.2f}%)\n"
+        indices_text = "".join(
+            f"- {idx.name}: {idx.current:.2f} "
+            f"({_DIRECTION_ARROWS[(idx.change_pct > 0) - (idx.change_pct < 0) + 1]}{abs(idx.change_pct):.2f}%)\n"
+            for idx in overview.indices
+        )
         
-        # 新闻信息 - 支持 SearchResult 对象或字典
-        news_text = ""
-        for i, n in enumerate(news[:6], 1):
-            # 兼容 SearchResult 对象和字典
-            if hasattr(n, 'title'):
-                title = n.title[:50] if n.title else ''
-                snippet = n.snippet[:100] if n.snippet else ''
-            else:
-                title = n.get('title', '')[:50]
-                snippet = n.get('snippet', '')[:100]
-            news_text += f"{i}. {title}\n   {snippet}\n"
+        # 新闻信息 - (标题, 摘要) 元组，已在 search_market_news 中统一格式
+        news_text = "".join(
+            f"{i}. {title[:50]}\n   {snippet[:100]}\n"
+            for i, (title, snippet) in enumerate(news[:6], 1)
+        )
         
-        prompt = f"""你是一位专业的美股/港股市场分析师，请根据以下数据生成一份简洁的大盘复盘报告。
-
-【重要】输出要求：
-- 必须输出纯 Markdown 文本格式
-- 禁止输出 JSON 格式
-- 禁止输出代码块
-- emoji 仅在标题处少量使用（每个标题最多1个）
-
----
-
-# 今日市场数据
-
-## 日期
-{overview.date}
-
-## 主要指数
-{indices_text if indices_text else "暂无指数数据（接口异常）"}
-
-## 市场新闻
-{news_text if news_text else "暂无相关新闻"}
-
-{"注意：由于行情数据获取失败，请主要根据【市场新闻】进行定性分析和总结，不要编造具体的指数点位。" if not indices_text else ""}
-
----
-
-# 输出格式模板（请严格按此格式输出）
-
-## 📊 {overview.date} 全球市场复盘
-
-### 一、市场总结
-（2-3句话概括今日纳斯达克和恒生指数的整体表现）
-
-### 二、指数点评
-（分析纳斯达克综合指数和恒生指数的走势特点、技术形态）
-
-### 三、市场热点
-（解读当前美股和港股市场的热点板块、主题投资机会）
-
-### 四、影响因素
-（分析影响市场走势的关键因素：美联储政策、经济数据、地缘政治等）
-
-### 五、后市展望
-（结合当前走势和新闻，给出未来市场预判）
-
-### 六、风险提示
-（需要关注的风险点）
-
----
-
-请直接输出复盘报告内容，不要输出其他说明文字。
-"""
-        return prompt
+        tmpl = _TMPL_WITH_INDICES if indices_text else _TMPL_NEWS_ONLY
+        return tmpl.format(
+            date=overview.date,
+            indices=indices_text,
+            news=news_text or "暂无相关新闻",
+        )
     
     def _generate_template_review(self, overview: MarketOverview, news: List) -> str:
         """使用模板生成复盘报告（无大模型时的备选方案）"""
@@ -360,7 +408,7 @@ class MarketAnalyzer:
         # 指数行情（简洁格式）
         indices_text = ""
         for idx in overview.indices:
-            direction = "↑" if idx.change_pct > 0 else "↓" if idx.change_pct < 0 else "-"
+            direction = _DIRECTION_ARROWS[(idx.change_pct > 0) - (idx.change_pct < 0) + 1]
             indices_text += f"- **{idx.name}**: {idx.current:.2f} ({direction}{abs(idx.change_pct):.2f}%)\n"
         
         report = f"""## 📊 {overview.date} 全球市场复盘